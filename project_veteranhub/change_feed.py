@@ -0,0 +1,517 @@
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import uuid
+
+# Журнал змін (change feed) для інкрементальної синхронізації між вузлами.
+# Кожна зміна (додавання/редагування/видалення) отримує монотонно зростаючий
+# номер послідовності (seq). Експортуються лише зміни після заданого seq,
+# тому вартість синхронізації залежить від кількості змін, а не від розміру даних.
+CHANGE_LOG_FILE = "data/changes.jsonl"
+FEED_STATE_FILE = "data/feed_state.json"
+# Конфліктні зміни, що чекають на повторну спробу або ручне розв'язання
+CONFLICTS_FILE = "data/feed_conflicts.json"
+
+# Позначки запущених застосунків (по файлу з PID на процес).
+# Поки застосунок працює, він тримає дані в пам'яті і перезапише їх при збереженні,
+# тому застосування дельт у цей час відхиляється.
+RUNNING_DIR = "data/running"
+
+# Поля, що мають лише локальне значення (перенумеровуються при застосуванні)
+# і тому не враховуються при порівнянні записів між вузлами
+LOCAL_FIELDS = ("veteran_id",)
+
+# Шаблон імені файлу з дельтою: вузол-джерело та діапазон послідовностей
+DELTA_FILE_PREFIX = "changes_"
+
+def _content(data):
+    """Вміст запису без локальних полів (LOCAL_FIELDS)."""
+    return {key: value for key, value in data.items() if key not in LOCAL_FIELDS}
+
+def record_fingerprint(data):
+    """
+    Обчислює відбиток запису (словника) для виявлення конфліктів.
+    Повертає None для відсутнього запису.
+    """
+    if data is None:
+        return None
+    payload = json.dumps(_content(data), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def resource_key(resource):
+    """
+    Ключ ресурсу у журналі змін.
+    Ресурси не мають ID, тому ключем є відбиток їхнього вмісту.
+    """
+    return record_fingerprint(resource.to_dict())
+
+def _load_state():
+    """
+    Завантажує стан журналу: ID вузла, останній seq, лічильник власних змін (own_seq)
+    та номери вже оброблених змін від кожного вузла.
+    applied[вузол] - усі зміни до цього номера включно оброблено;
+    done[вузол] - оброблені номери після розриву (наприклад, після конфлікту).
+    """
+    try:
+        with open(FEED_STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        state = {}
+    state.setdefault("node_id", uuid.uuid4().hex[:12])
+    state.setdefault("last_seq", 0)
+    state.setdefault("applied", {})
+    state.setdefault("done", {})
+    # Власні зміни нумеруються окремо від переданих далі, щоб номери були без розривів
+    state.setdefault("own_seq", state["applied"].get(state["node_id"], 0))
+    state.setdefault("uid_seq", 0)
+    return state
+
+def _save_state(state):
+    """Атомарно зберігає стан журналу (через тимчасовий файл)."""
+    os.makedirs(os.path.dirname(FEED_STATE_FILE), exist_ok=True)
+    tmp_path = FEED_STATE_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, FEED_STATE_FILE)
+
+def new_uid():
+    """
+    Створює ідентифікатор запису, унікальний для всіх вузлів: "<вузол>:<номер>".
+    Номер береться з лічильника, що ніколи не зменшується, тому uid видаленого
+    запису не дістанеться новому (на відміну від локального max(ID) + 1).
+    """
+    state = _load_state()
+    state["uid_seq"] += 1
+    _save_state(state)
+    return f"{state['node_id']}:{state['uid_seq']}"
+
+def mark_app_running():
+    """
+    Позначає поточний процес як запущений застосунок.
+    Позначка видаляється при завершенні процесу (зокрема після Ctrl-C).
+    """
+    os.makedirs(RUNNING_DIR, exist_ok=True)
+    marker = os.path.join(RUNNING_DIR, str(os.getpid()))
+    with open(marker, 'w', encoding='utf-8'):
+        pass
+    atexit.register(_remove_marker, marker)
+
+def _remove_marker(marker):
+    try:
+        os.remove(marker)
+    except FileNotFoundError:
+        pass
+
+def _process_alive(pid):
+    """Перевіряє, чи існує процес з таким PID."""
+    if os.name == 'nt':
+        # На Windows os.kill завершує процес, тому позначка вважається дійсною
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def running_app_pids():
+    """
+    Повертає PID запущених застосунків.
+    Позначки процесів, що завершилися аварійно, видаляються.
+    """
+    try:
+        names = os.listdir(RUNNING_DIR)
+    except FileNotFoundError:
+        return []
+    pids = []
+    for name in names:
+        if not name.isdigit():
+            continue
+        if _process_alive(int(name)):
+            pids.append(int(name))
+        else:
+            _remove_marker(os.path.join(RUNNING_DIR, name))
+    return pids
+
+def _is_processed(state, origin, origin_seq):
+    """Перевіряє, чи зміну origin/origin_seq вже оброблено на цьому вузлі."""
+    return (origin_seq <= state["applied"].get(origin, 0)
+            or origin_seq in state["done"].get(origin, []))
+
+def _mark_processed(state, origin, origin_seq):
+    """
+    Позначає зміну як оброблену.
+    applied[origin] просувається лише через суцільний діапазон номерів,
+    тому конфліктна зміна не буде пропущена при наступному застосуванні.
+    """
+    done = set(state["done"].get(origin, []))
+    done.add(origin_seq)
+    watermark = state["applied"].get(origin, 0)
+    while watermark + 1 in done:
+        watermark += 1
+    state["applied"][origin] = watermark
+    done = sorted(seq for seq in done if seq > watermark)
+    if done:
+        state["done"][origin] = done
+    else:
+        state["done"].pop(origin, None)
+
+def _append_to_log(state, entity, op, key, data, base, origin, origin_seq):
+    """
+    Дописує зміну в кінець журналу з наступним номером послідовності.
+    origin/origin_seq зберігають вузол, на якому зміна виникла, та її номер на ньому.
+    """
+    state["last_seq"] += 1
+    change = {
+        "seq": state["last_seq"],
+        "origin": origin,
+        "origin_seq": origin_seq,
+        "entity": entity,
+        "op": op,
+        "key": key,
+        "data": data,
+        "base": base,
+    }
+    os.makedirs(os.path.dirname(CHANGE_LOG_FILE), exist_ok=True)
+    with open(CHANGE_LOG_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(change, ensure_ascii=False) + "\n")
+    return change
+
+def record_change(entity, op, key, data=None, previous=None):
+    """
+    Реєструє локальну зміну у журналі та повертає її номер послідовності.
+    entity - "veterans" або назва категорії ресурсів ("jobs", ...).
+    op - "add", "edit" або "delete".
+    previous - стан запису до зміни (для виявлення конфліктів при застосуванні).
+    """
+    try:
+        state = _load_state()
+        state["own_seq"] += 1
+        change = _append_to_log(state, entity, op, key, data, record_fingerprint(previous),
+                                state["node_id"], state["own_seq"])
+        # Власні зміни вважаються застосованими на цьому вузлі
+        _mark_processed(state, state["node_id"], state["own_seq"])
+        _save_state(state)
+        return change["seq"]
+    except Exception as e:
+        print(f"Помилка при записі у журнал змін: {e}")
+        return None
+
+def read_changes(since_seq=0):
+    """
+    Генератор змін з номером послідовності більшим за since_seq.
+    """
+    try:
+        with open(CHANGE_LOG_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                change = json.loads(line)
+                if change["seq"] > since_seq:
+                    yield change
+    except FileNotFoundError:
+        return
+
+def export_changes(since_seq, target_dir):
+    """
+    Експортує зміни після since_seq у файл у директорії target_dir.
+    Повертає шлях до створеного файлу або None, якщо нових змін немає.
+    """
+    changes = list(read_changes(since_seq))
+    if not changes:
+        return None
+    state = _load_state()
+    _save_state(state)
+    first_seq, last_seq = changes[0]["seq"], changes[-1]["seq"]
+    filename = f"{DELTA_FILE_PREFIX}{state['node_id']}_{first_seq:08d}_{last_seq:08d}.json"
+    os.makedirs(target_dir, exist_ok=True)
+    filepath = os.path.join(target_dir, filename)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump({"node_id": state["node_id"], "changes": changes}, f, ensure_ascii=False, indent=2)
+    return filepath
+
+def _load_local_records():
+    """
+    Завантажує поточні дані вузла у вигляді словників {entity: {key: запис}}.
+    Імпорти всередині функції, щоб уникнути циклічних залежностей.
+    """
+    from data_manager import load_resources
+    from veteranHubApp import load_veterans
+    from veteransHub import DATA_FILES
+
+    records = {"veterans": {v.uid: dict(v.to_dict()) for v in load_veterans()}}
+    for category, filename in DATA_FILES.items():
+        records[category] = {
+            resource_key(r): r.to_dict() for r in load_resources(filename, category)
+        }
+    return records
+
+def _save_local_records(records, changed_entities):
+    """Зберігає лише ті сутності, які змінилися під час застосування дельт."""
+    from data_manager import resource_from_dict, save_resources
+    from veteranHubApp import Veteran, save_veterans
+    from veteransHub import DATA_FILES
+
+    if "veterans" in changed_entities:
+        veterans = sorted(records["veterans"].values(), key=lambda d: d["veteran_id"])
+        save_veterans([Veteran.from_dict(d) for d in veterans])
+    for category, filename in DATA_FILES.items():
+        if category in changed_entities:
+            save_resources([resource_from_dict(d) for d in records[category].values()], filename)
+
+def _assign_local_id(table, key, current, data):
+    """
+    Підбирає локальний veteran_id для запису з іншого вузла.
+    Існуючий запис зберігає свій ID; новий отримує наступний вільний,
+    якщо його ID вже зайнятий іншим записом (одночасні додавання на різних вузлах).
+    """
+    if current is not None:
+        return dict(data, veteran_id=current["veteran_id"])
+    taken = {record["veteran_id"] for other_key, record in table.items() if other_key != key}
+    if data["veteran_id"] in taken:
+        return dict(data, veteran_id=max(taken) + 1)
+    return data
+
+def _identity(entity, data):
+    """
+    Відбиток запису (словника) за ключовими полями його класу (див. dedup.py).
+    """
+    from data_manager import CLASS_MAP
+    from dedup import values_fingerprint
+    from veteranHubApp import Veteran
+
+    record_class = Veteran if entity == "veterans" else CLASS_MAP[data["type"]]
+    return values_fingerprint(record_class, data)
+
+def _build_identities(records):
+    """
+    Індекс ключових полів локальних записів: {entity: {відбиток: множина ключів}}.
+    Дозволяє відхиляти дублікати, що надходять через журнал, за O(1).
+    """
+    identities = {}
+    for entity, table in records.items():
+        for key, data in table.items():
+            identities.setdefault(entity, {}).setdefault(_identity(entity, data), set()).add(key)
+    return identities
+
+def _unindex(identities, entity, key, data):
+    """Видаляє ключ запису з індексу ключових полів."""
+    keys = identities.get(entity, {}).get(_identity(entity, data))
+    if keys is not None:
+        keys.discard(key)
+
+def _apply_one(records, identities, change):
+    """
+    Застосовує одну зміну до локальних записів.
+    Повертає "applied", "skipped" (вже застосовано), "duplicate"
+    (додавання запису, що дублює наявний за ключовими полями) або "conflict".
+    """
+    entity, op, key, data = change["entity"], change["op"], change["key"], change["data"]
+    table = records.setdefault(entity, {})
+    entity_identities = identities.setdefault(entity, {})
+    current = table.get(key)
+    if data is not None and "veteran_id" in data:
+        data = _assign_local_id(table, key, current, data)
+
+    if op == "add":
+        if current is None:
+            fingerprint = _identity(entity, data)
+            if entity_identities.get(fingerprint):
+                return "duplicate"
+            table[key] = data
+            entity_identities.setdefault(fingerprint, set()).add(key)
+            return "applied"
+        return "skipped" if _content(current) == _content(data) else "conflict"
+    if op == "edit":
+        if current is not None and _content(current) == _content(data):
+            return "skipped"
+        if current is None or record_fingerprint(current) != change["base"]:
+            return "conflict"
+        _unindex(identities, entity, key, current)
+        table[key] = data
+        entity_identities.setdefault(_identity(entity, data), set()).add(key)
+        return "applied"
+    if op == "delete":
+        if current is None:
+            return "skipped"
+        if record_fingerprint(current) != change["base"]:
+            return "conflict"
+        _unindex(identities, entity, key, current)
+        del table[key]
+        return "applied"
+    return "conflict"
+
+def _load_conflicts():
+    """Завантажує список конфліктних змін, що очікують на розв'язання."""
+    try:
+        with open(CONFLICTS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+def _save_conflicts(conflicts):
+    """Зберігає список конфліктних змін (порожній список видаляє файл)."""
+    if not conflicts:
+        if os.path.exists(CONFLICTS_FILE):
+            os.remove(CONFLICTS_FILE)
+        return
+    os.makedirs(os.path.dirname(CONFLICTS_FILE), exist_ok=True)
+    with open(CONFLICTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(conflicts, f, ensure_ascii=False, indent=2)
+
+def apply_changes(source_dir):
+    """
+    Застосовує всі дельти з директорії source_dir ідемпотентно.
+    Зміни кожного файлу застосовуються в порядку журналу, з якого їх експортовано.
+    Зміни, вже оброблені раніше (за origin/origin_seq), пропускаються.
+    Додавання, що дублюють наявні записи за ключовими полями, не застосовуються
+    і разом з конфліктами чекають на розгляд (поле "reason" - "duplicate" або "conflict").
+    Конфліктні зміни повторюються, поки є прогрес (зміна могла залежати від іншого файлу),
+    а ті, що лишились, зберігаються у CONFLICTS_FILE для наступної спроби або ручного розгляду.
+    Застосовані зміни заносяться в локальний журнал, щоб їх можна було передати далі.
+    """
+    state = _load_state()
+    summary = {"applied": 0, "skipped": 0, "conflicts": []}
+
+    # Спочатку - раніше відкладені конфлікти, потім нові файли
+    queue = _load_conflicts()
+    try:
+        filenames = sorted(os.listdir(source_dir))
+    except FileNotFoundError:
+        print(f"Директорію {source_dir} не знайдено, застосовуються лише відкладені зміни.")
+        filenames = []
+    for filename in filenames:
+        if not (filename.startswith(DELTA_FILE_PREFIX) and filename.endswith(".json")):
+            continue
+        # Власні експортовані файли не читаємо
+        if filename.startswith(f"{DELTA_FILE_PREFIX}{state['node_id']}_"):
+            continue
+        with open(os.path.join(source_dir, filename), 'r', encoding='utf-8') as f:
+            queue.extend(json.load(f)["changes"])
+
+    # Зміна могла прийти кількома шляхами (напряму і через центральний вузол)
+    unique = {}
+    for change in queue:
+        if change["origin"] == state["node_id"] or _is_processed(state, change["origin"], change["origin_seq"]):
+            summary["skipped"] += 1
+            continue
+        unique.setdefault((change["origin"], change["origin_seq"]), change)
+    conflicts = list(unique.values())
+    if not conflicts:
+        _save_conflicts([])
+        return summary
+
+    records = _load_local_records()
+    identities = _build_identities(records)
+    changed_entities = set()
+    while conflicts:
+        remaining = []
+        for change in conflicts:
+            result = _apply_one(records, identities, change)
+            if result in ("conflict", "duplicate"):
+                remaining.append(dict(change, reason=result))
+                continue
+            if result == "applied":
+                changed_entities.add(change["entity"])
+                _append_to_log(state, change["entity"], change["op"], change["key"],
+                               change["data"], change["base"],
+                               change["origin"], change["origin_seq"])
+                summary["applied"] += 1
+            else:
+                summary["skipped"] += 1
+            _mark_processed(state, change["origin"], change["origin_seq"])
+        progress = len(remaining) < len(conflicts)
+        conflicts = remaining
+        if not progress:
+            break
+
+    summary["conflicts"] = conflicts
+    _save_local_records(records, changed_entities)
+    _save_conflicts(conflicts)
+    _save_state(state)
+    return summary
+
+def discard_conflict(origin, origin_seq):
+    """
+    Відкидає конфліктну зміну після ручного розв'язання.
+    Повертає False, якщо такої зміни немає серед відкладених.
+    """
+    conflicts = _load_conflicts()
+    remaining = [c for c in conflicts if (c["origin"], c["origin_seq"]) != (origin, origin_seq)]
+    if len(remaining) == len(conflicts):
+        return False
+    state = _load_state()
+    _mark_processed(state, origin, origin_seq)
+    _save_state(state)
+    _save_conflicts(remaining)
+    return True
+
+def _print_conflicts(conflicts):
+    """Виводить список конфліктних змін."""
+    for change in conflicts:
+        label = "Дублікат" if change.get("reason") == "duplicate" else "Конфлікт"
+        print(f"  {label}: {change['entity']} {change['op']} {change['key']} "
+              f"(вузол {change['origin']}, #{change['origin_seq']})")
+
+def main():
+    """
+    Командний рядок для синхронізації:
+        python change_feed.py status
+        python change_feed.py export --since N <директорія>
+        python change_feed.py apply <директорія>
+        python change_feed.py conflicts
+        python change_feed.py discard <вузол> <номер>
+    """
+    parser = argparse.ArgumentParser(description="Журнал змін для синхронізації між вузлами")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="Показати ID вузла та останній номер послідовності")
+    export_parser = subparsers.add_parser("export", help="Експортувати зміни після номера N")
+    export_parser.add_argument("--since", type=int, default=0)
+    export_parser.add_argument("directory")
+    apply_parser = subparsers.add_parser("apply", help="Застосувати дельти з директорії")
+    apply_parser.add_argument("directory")
+    apply_parser.add_argument("--force", action="store_true",
+                              help="Застосувати, навіть якщо застосунок запущено")
+    subparsers.add_parser("conflicts", help="Показати відкладені конфліктні зміни")
+    discard_parser = subparsers.add_parser("discard", help="Відкинути конфліктну зміну після ручного розв'язання")
+    discard_parser.add_argument("origin")
+    discard_parser.add_argument("origin_seq", type=int)
+    args = parser.parse_args()
+
+    if args.command == "status":
+        state = _load_state()
+        _save_state(state)
+        print(f"Вузол: {state['node_id']}")
+        print(f"Останній номер послідовності: {state['last_seq']}")
+    elif args.command == "export":
+        filepath = export_changes(args.since, args.directory)
+        if filepath:
+            print(f"Зміни експортовано у файл {filepath}")
+        else:
+            print(f"Немає змін після номера {args.since}.")
+    elif args.command == "apply":
+        pids = running_app_pids()
+        if pids and not args.force:
+            print(f"Застосування скасовано: застосунок працює (PID {', '.join(map(str, pids))}) "
+                  f"і перезапише застосовані зміни при збереженні. Закрийте його або використайте --force.")
+            return
+        summary = apply_changes(args.directory)
+        print(f"Застосовано: {summary['applied']}, пропущено: {summary['skipped']}, "
+              f"конфліктів: {len(summary['conflicts'])}")
+        _print_conflicts(summary["conflicts"])
+    elif args.command == "conflicts":
+        conflicts = _load_conflicts()
+        print(f"Відкладених конфліктів: {len(conflicts)}")
+        _print_conflicts(conflicts)
+    elif args.command == "discard":
+        if discard_conflict(args.origin, args.origin_seq):
+            print("Конфліктну зміну відкинуто.")
+        else:
+            print("Такої конфліктної зміни немає.")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import json
 import os
+from dedup import content_fingerprint
 from resource_classes import JobPosting, PsychologistContact, LegalAid, EducationProgram, SocialGroup
 
 # Словник для мапінгу строкових назв класів до самих класів
@@ -11,49 +12,65 @@ CLASS_MAP = {
     "SocialGroup": SocialGroup
 }
 
+def resource_from_dict(item):
+    """
+    Створює об'єкт ресурсу зі словника за полем 'type'.
+    Повертає None, якщо тип відсутній або невідомий.
+    """
+    # Використання інформації про тип для коректної десеріалізації
+    item_type = item.get("type")
+    if item_type == "JobPosting":
+        return JobPosting(
+            item['title'], item['company'], item['description'],
+            set(item['requirements']), item['contact']
+        )
+    elif item_type == "PsychologistContact":
+        return PsychologistContact(
+            item['name'], item['specialization'], item['contact'],
+            item['schedule'] # Завантажуємо як рядок
+        )
+    elif item_type == "LegalAid":
+        return LegalAid(
+            item['title'], # Тепер title - це назва організації
+            item['service_type'], item['contact'],
+            item['description']
+        )
+    elif item_type == "EducationProgram":
+        return EducationProgram(
+            item['name'], item['institution'], item['duration'],
+            item['description'], item['contact']
+        )
+    elif item_type == "SocialGroup":
+        return SocialGroup(
+            item['name'], item['focus_area'], item['location'],
+            item['contact'], item['description']
+        )
+    return None
+
 def load_resources(filepath, category_name):
     """
     Завантажує ресурси з JSON файлу.
     Використовує менеджер контексту 'with open'.
     Обробляє виключення FileNotFoundError.
+    Точні дублікати записів пропускаються.
     """
     resources_list = []
+    seen_fingerprints = set() # Множина для перевірки дублікатів за O(1)
+    skipped_duplicates = 0
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
             for item in data:
-                # Використання інформації про тип для коректної десеріалізації
                 item_type = item.get("type")
                 if item_type and item_type in CLASS_MAP:
                     # Динамічне створення об'єкта класу з даних словника
-                    if item_type == "JobPosting":
-                        resources_list.append(JobPosting(
-                            item['title'], item['company'], item['description'],
-                            set(item['requirements']), item['contact']
-                        ))
-                    elif item_type == "PsychologistContact":
-                        resources_list.append(PsychologistContact(
-                            item['name'], item['specialization'], item['contact'],
-                            item['schedule'] # Завантажуємо як рядок
-                        ))
-                    elif item_type == "LegalAid":
-                        resources_list.append(LegalAid(
-                            item['title'], # Тепер title - це назва організації
-                            item['service_type'], item['contact'],
-                            item['description']
-                        ))
-                    elif item_type == "EducationProgram":
-                        resources_list.append(EducationProgram(
-                            item['name'], item['institution'], item['duration'],
-                            item['description'], item['contact']
-                        ))
-                    elif item_type == "SocialGroup":
-                        resources_list.append(SocialGroup(
-                            item['name'], item['focus_area'], item['location'],
-                            item['contact'], item['description']
-                        ))
-                    else:
-                        print(f"Попередження: Невідомий тип ресурсу '{item_type}' у файлі {filepath}")
+                    resource = resource_from_dict(item)
+                    fingerprint = content_fingerprint(resource)
+                    if fingerprint in seen_fingerprints:
+                        skipped_duplicates += 1
+                        continue
+                    seen_fingerprints.add(fingerprint)
+                    resources_list.append(resource)
                 else:
                     print(f"Попередження: Відсутній або невідомий тип ресурсу у записі: {item}")
     except FileNotFoundError:
@@ -65,6 +82,8 @@ def load_resources(filepath, category_name):
     except Exception as e:
         print(f"Невідома помилка при завантаженні файлу {filepath}: {e}")
         return []
+    if skipped_duplicates:
+        print(f"Попередження: Пропущено {skipped_duplicates} точних дублікатів у файлі {filepath}")
     return resources_list
 
 def save_resources(resources_list, filepath):
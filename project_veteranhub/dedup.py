@@ -0,0 +1,193 @@
+import argparse
+from change_feed import record_change, record_fingerprint
+
+# Індекс відбитків (fingerprint) для швидкого виявлення дублікатів.
+# Відбиток - це кортеж нормалізованих значень ключових полів запису
+# (IDENTITY_FIELDS класу), тому перевірка на дублікат - це пошук у словнику за O(1).
+
+def normalize(value):
+    """
+    Нормалізує значення поля для порівняння:
+    регістр не враховується, зайві пробіли прибираються, множини впорядковуються.
+    """
+    if isinstance(value, str):
+        return " ".join(value.casefold().split())
+    if isinstance(value, (set, frozenset, list, tuple)):
+        return tuple(sorted(normalize(item) for item in value))
+    return value
+
+def make_fingerprint(*values):
+    """Створює відбиток з переданих значень."""
+    return tuple(normalize(value) for value in values)
+
+def identity_fingerprint(record):
+    """
+    Відбиток запису за його ключовими полями (IDENTITY_FIELDS).
+    Два записи з однаковим відбитком вважаються дублікатами.
+    """
+    return make_fingerprint(*(getattr(record, field) for field in record.IDENTITY_FIELDS))
+
+def values_fingerprint(record_class, values):
+    """
+    Відбиток за словником значень полів (наприклад, to_dict() або вже введені поля).
+    Ключові поля беруться з record_class.IDENTITY_FIELDS.
+    """
+    return make_fingerprint(*(values[field] for field in record_class.IDENTITY_FIELDS))
+
+def content_fingerprint(record):
+    """
+    Відбиток усього вмісту запису (за словником to_dict()).
+    Збігається лише для точних дублікатів.
+    """
+    data = record.to_dict()
+    return tuple((key, normalize(data[key])) for key in sorted(data))
+
+class FingerprintIndex:
+    """
+    Індекс записів за відбитком ключових полів.
+    Дозволяє перевіряти наявність дубліката за O(1) замість перебору списку.
+    Кожному відбитку відповідає список записів, тож дублікати, що вже є у файлі, теж представлені.
+    """
+    def __init__(self, records=()):
+        self._records = {}
+        for record in records:
+            self.add(record, allow_duplicate=True)
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+    def find(self, record):
+        """Повертає інший проіндексований запис з таким самим відбитком або None."""
+        for indexed in self._records.get(identity_fingerprint(record), ()):
+            if indexed is not record:
+                return indexed
+        return None
+
+    def add(self, record, allow_duplicate=False):
+        """
+        Додає запис до індексу.
+        Повертає False (і не додає), якщо запис з таким відбитком вже існує,
+        крім випадку allow_duplicate=True (завантаження наявних даних).
+        """
+        fingerprint = identity_fingerprint(record)
+        if fingerprint in self._records and not allow_duplicate:
+            return False
+        self._records.setdefault(fingerprint, []).append(record)
+        return True
+
+    def remove(self, record, fingerprint=None):
+        """
+        Видаляє саме цей об'єкт з індексу.
+        fingerprint передається, якщо ключові поля запису вже змінено.
+        """
+        fingerprint = fingerprint if fingerprint is not None else identity_fingerprint(record)
+        remaining = [indexed for indexed in self._records.get(fingerprint, ()) if indexed is not record]
+        if remaining:
+            self._records[fingerprint] = remaining
+        else:
+            self._records.pop(fingerprint, None)
+
+def find_duplicates(records):
+    """
+    Знаходить групи дублікатів за один прохід.
+    Повертає список (оригінал, [дублікати]) у порядку появи оригіналів.
+    """
+    groups = {}
+    for record in records:
+        groups.setdefault(identity_fingerprint(record), []).append(record)
+    return [(group[0], group[1:]) for group in groups.values() if len(group) > 1]
+
+def merge_into(original, duplicate):
+    """
+    Об'єднує дублікат з оригіналом: порожні поля оригіналу заповнюються
+    значеннями дубліката, множини (наприклад, вимоги вакансії) об'єднуються.
+    """
+    for field, value in vars(duplicate).items():
+        current = getattr(original, field, None)
+        if isinstance(current, set) and isinstance(value, set):
+            current.update(value)
+        elif current in (None, "") and value not in (None, ""):
+            setattr(original, field, value)
+    return original
+
+def deduplicate(records, merge=False):
+    """
+    Повертає список без дублікатів, зберігаючи порядок перших входжень.
+    Якщо merge=True, дані дублікатів об'єднуються з оригіналом.
+    """
+    index = {}
+    for record in records:
+        fingerprint = identity_fingerprint(record)
+        if fingerprint not in index:
+            index[fingerprint] = record
+        elif merge:
+            merge_into(index[fingerprint], record)
+    return list(index.values())
+
+def record_merge_changes(category, records, merged, previous_states):
+    """
+    Реєструє результат об'єднання в журналі змін, щоб інші вузли отримали ті самі записи.
+    previous_states - {id(запис): словник запису до об'єднання}.
+    Видалені дублікати записуються як "delete", змінені оригінали ветеранів - як "edit".
+    Ресурси ідентифікуються відбитком вмісту, тому змінений ресурс записується як "delete" + "add".
+    """
+    kept = {id(record) for record in merged}
+    for record in records:
+        previous = previous_states[id(record)]
+        current = dict(record.to_dict())
+        old_key = previous["uid"] if category == "veterans" else record_fingerprint(previous)
+        if id(record) not in kept:
+            record_change(category, "delete", old_key, previous=previous)
+        elif current != previous:
+            if category == "veterans":
+                record_change(category, "edit", old_key, current, previous)
+            else:
+                record_change(category, "delete", old_key, previous=previous)
+                record_change(category, "add", record_fingerprint(current), current)
+
+def _describe(record):
+    """Короткий опис запису для звіту."""
+    return " | ".join(str(getattr(record, field)) for field in record.IDENTITY_FIELDS)
+
+def main():
+    """
+    Пакетна перевірка файлів даних на дублікати:
+        python dedup.py           - лише звіт
+        python dedup.py --merge   - звіт та об'єднання дублікатів у файлах
+    """
+    from data_manager import load_resources, save_resources
+    from veteranHubApp import load_veterans, save_veterans
+    from veteransHub import DATA_FILES
+
+    parser = argparse.ArgumentParser(description="Пошук та об'єднання дублікатів у файлах даних")
+    parser.add_argument("--merge", action="store_true", help="Об'єднати знайдені дублікати та зберегти файли")
+    args = parser.parse_args()
+
+    datasets = {category: load_resources(filename, category) for category, filename in DATA_FILES.items()}
+    datasets["veterans"] = load_veterans()
+
+    total_duplicates = 0
+    for category, records in datasets.items():
+        groups = find_duplicates(records)
+        duplicates = sum(len(dups) for _, dups in groups)
+        total_duplicates += duplicates
+        print(f"{category}: {len(records)} записів, дублікатів: {duplicates}")
+        for original, dups in groups:
+            print(f"  {_describe(original)} (x{len(dups) + 1})")
+        if args.merge and duplicates:
+            previous_states = {id(record): dict(record.to_dict()) for record in records}
+            merged = deduplicate(records, merge=True)
+            record_merge_changes(category, records, merged, previous_states)
+            if category == "veterans":
+                save_veterans(merged)
+            else:
+                save_resources(merged, DATA_FILES[category])
+
+    if args.merge and total_duplicates:
+        print(f"Об'єднано дублікатів: {total_duplicates}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import sys
+import tracemalloc
+from collections import defaultdict
+
+# Звіт про використання пам'яті ресурсами та списком ветеранів.
+# Глибокий розмір рахується через sys.getsizeof з обходом вкладених об'єктів,
+# а tracemalloc дозволяє порівнювати знімки пам'яті до та після змін.
+# Відстеження tracemalloc сповільнює програму, тому вмикається лише на час вимірювання.
+
+def deep_sizeof(obj, seen=None):
+    """
+    Повертає глибокий розмір об'єкта в байтах (разом з вкладеними об'єктами).
+    Множина seen запобігає повторному підрахунку спільних об'єктів.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, '__dict__'):
+        size += deep_sizeof(obj.__dict__, seen)
+    return size
+
+def _iter_strings(value):
+    """Генератор рядків, що містяться у значенні поля (рядок або колекція рядків)."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            yield from _iter_strings(item)
+
+def category_sizes(resources):
+    """
+    Розмір кожної категорії ресурсів: {категорія: (кількість, байти)}.
+    """
+    return {
+        category: (len(items), deep_sizeof(items))
+        for category, items in resources.items()
+    }
+
+def report_sizes(resources, veterans=()):
+    """
+    Розміри категорій ресурсів разом зі списком ветеранів: {категорія: (кількість, байти)}.
+    """
+    sizes = category_sizes(resources)
+    sizes["veterans"] = (len(veterans), deep_sizeof(list(veterans)))
+    return sizes
+
+def class_sizes(records):
+    """
+    Розмір записів за класами: {назва класу: (кількість, байти)}.
+    """
+    totals = defaultdict(lambda: [0, 0])
+    seen = set()
+    for record in records:
+        entry = totals[record.__class__.__name__]
+        entry[0] += 1
+        entry[1] += deep_sizeof(record, seen)
+    return {name: tuple(entry) for name, entry in totals.items()}
+
+def field_sizes(records):
+    """
+    Розмір полів за класами: {(назва класу, поле): байти}.
+    Рахуються лише значення полів, без службових структур об'єкта.
+    """
+    totals = defaultdict(int)
+    seen = set()
+    for record in records:
+        for field, value in vars(record).items():
+            totals[(record.__class__.__name__, field)] += deep_sizeof(value, seen)
+    return dict(totals)
+
+def duplicate_strings(records, limit=10):
+    """
+    Знаходить однакові рядки, що зберігаються як окремі об'єкти.
+    Повертає список (рядок, кількість копій, зайві байти), відсортований за зайвими байтами.
+    Такі рядки варто інтернувати (sys.intern) або замінити спільним об'єктом.
+    """
+    copies = defaultdict(set)
+    for record in records:
+        for value in vars(record).values():
+            for text in _iter_strings(value):
+                copies[text].add(id(text))
+    duplicates = [
+        (text, len(ids), (len(ids) - 1) * sys.getsizeof(text))
+        for text, ids in copies.items() if len(ids) > 1
+    ]
+    duplicates.sort(key=lambda item: item[2], reverse=True)
+    return duplicates[:limit]
+
+def take_snapshot():
+    """
+    Робить знімок пам'яті через tracemalloc (відстеження має бути ввімкнене).
+    Виділення пам'яті самим модулем tracemalloc не враховуються.
+    """
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ])
+
+def compare_snapshots(before, after, limit=10):
+    """
+    Порівнює два знімки tracemalloc.
+    Повертає (загальна зміна в байтах, список найбільших змін за рядками коду).
+    """
+    stats = after.compare_to(before, 'lineno')
+    total = sum(stat.size_diff for stat in stats)
+    return total, stats[:limit]
+
+def _format_size(size):
+    """Форматує розмір у байтах у зручному для читання вигляді."""
+    for unit in ("Б", "КБ"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "Б" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} МБ"
+
+def build_report(resources, veterans=(), before=None, after=None, previous_sizes=None, sizes=None):
+    """
+    Формує текстовий звіт про пам'ять у вигляді списку рядків.
+    Якщо передано знімки before/after, додає порівняння tracemalloc.
+    Якщо передано previous_sizes (результат report_sizes з попереднього звіту),
+    для кожної категорії показується зміна розміру.
+    sizes - уже обчислений результат report_sizes, щоб не рахувати його повторно.
+    """
+    lines = ["--- Звіт про використання пам'яті ---", "\nЗа категоріями:"]
+    sizes = sizes if sizes is not None else report_sizes(resources, veterans)
+    for category, (count, size) in sizes.items():
+        line = f"  {category:<15} {count:>6} записів  {_format_size(size):>12}"
+        if previous_sizes is not None:
+            change = size - previous_sizes.get(category, (0, 0))[1]
+            line += f"  ({'+' if change >= 0 else '-'}{_format_size(abs(change))})"
+        lines.append(line)
+    lines.append(f"  {'Загалом':<15} {sum(c for c, _ in sizes.values()):>6} записів  "
+                 f"{_format_size(sum(s for _, s in sizes.values())):>12}")
+
+    records = [r for items in resources.values() for r in items] + list(veterans)
+    lines.append("\nЗа класами:")
+    for name, (count, size) in sorted(class_sizes(records).items(), key=lambda i: i[1][1], reverse=True):
+        lines.append(f"  {name:<20} {count:>6} шт.  {_format_size(size):>12}")
+
+    lines.append("\nЗа полями:")
+    for (name, field), size in sorted(field_sizes(records).items(), key=lambda i: i[1], reverse=True):
+        lines.append(f"  {name + '.' + field:<35} {_format_size(size):>12}")
+
+    duplicates = duplicate_strings(records)
+    if duplicates:
+        lines.append("\nДублікати рядків (кандидати на інтернування):")
+        for text, count, wasted in duplicates:
+            preview = text if len(text) <= 30 else text[:27] + "..."
+            lines.append(f"  '{preview}' x{count}  зайві {_format_size(wasted)}")
+
+    if before is not None and after is not None:
+        total, stats = compare_snapshots(before, after)
+        lines.append(f"\nЗміна пам'яті між знімками (tracemalloc): {_format_size(total)}")
+        for stat in stats:
+            lines.append(f"  {stat}")
+    return lines
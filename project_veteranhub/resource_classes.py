@@ -3,6 +3,9 @@ class VeteranResource:
     Базовий клас для всіх ресурсів, що надаються ветеранам.
     Визначає загальні атрибути та методи.
     """
+    # Поля, за якими два ресурси вважаються дублікатами (див. dedup.py)
+    IDENTITY_FIELDS = ("title", "contact")
+
     def __init__(self, title, description, contact):
         # Атрибути екземпляра
         self.title = title
@@ -34,6 +37,8 @@ class JobPosting(VeteranResource):
     Наслідує від VeteranResource.
     Демонструє використання змінних (рядки, множини) та методів класу.
     """
+    IDENTITY_FIELDS = ("title", "company")
+
     def __init__(self, title, company, description, requirements, contact):
         super().__init__(title, description, contact)
         self.company = company
@@ -48,7 +53,7 @@ class JobPosting(VeteranResource):
         base_dict = super().to_dict()
         base_dict.update({
             "company": self.company,
-            "requirements": list(self.requirements) # Перетворюємо множину на список для JSON
+            "requirements": sorted(self.requirements) # Перетворюємо множину на список для JSON (відсортований, щоб вміст був стабільним)
         })
         return base_dict
 
@@ -84,6 +89,8 @@ class LegalAid(VeteranResource):
     Клас для представлення інформації про юридичну допомогу.
     Наслідує від VeteranResource.
     """
+    IDENTITY_FIELDS = ("title", "service_type", "contact")
+
     def __init__(self, organization_name, service_type, contact, description):
         # organization_name стає title для базового класу
         super().__init__(organization_name, description, contact)
@@ -106,6 +113,8 @@ class EducationProgram(VeteranResource):
     Клас для представлення освітніх програм.
     Наслідує від VeteranResource.
     """
+    IDENTITY_FIELDS = ("name", "institution")
+
     def __init__(self, name, institution, duration, description, contact):
         super().__init__(name, description, contact)
         self.name = name
@@ -132,6 +141,8 @@ class SocialGroup(VeteranResource):
     Клас для представлення соціальних груп та спільнот.
     Наслідує від VeteranResource.
     """
+    IDENTITY_FIELDS = ("name", "location")
+
     def __init__(self, name, focus_area, location, contact, description):
         super().__init__(name, description, contact)
         self.name = name
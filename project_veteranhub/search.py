@@ -0,0 +1,141 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+# Глобальний пошук з ранжуванням за релевантністю (BM25 з вагами полів).
+# Збіг у назві важить більше, ніж збіг в описі.
+
+# Ваги полів; поля, яких немає у словнику, отримують DEFAULT_FIELD_BOOST
+FIELD_BOOSTS = {
+    "title": 3.0,
+    "description": 1.0,
+    "requirements": 1.0,
+    "contact": 0.5,
+}
+DEFAULT_FIELD_BOOST = 1.5
+
+# Параметри BM25: насичення частоти терміна та нормалізація за довжиною поля
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text):
+    """Розбиває текст на терміни у нижньому регістрі."""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+def _field_texts(resource):
+    """
+    Повертає {поле: текст} для індексації ресурсу.
+    Поле name пропускається, якщо воно дублює title.
+    """
+    fields = {}
+    for field, value in vars(resource).items():
+        if field == "name" and value == resource.title:
+            continue
+        if isinstance(value, (set, list, tuple)):
+            value = " ".join(str(item) for item in value)
+        fields[field] = str(value)
+    return fields
+
+class SearchIndex:
+    """
+    Інвертований індекс над усіма категоріями ресурсів.
+    Зберігає частоти термінів по полях, середні довжини полів та списки документів для кожного терміна.
+    """
+    def __init__(self, resources):
+        self.documents = [] # (категорія, ресурс, {поле: Counter термінів}, {поле: довжина})
+        self.postings = {}  # термін -> список номерів документів (за зростанням)
+        field_length_totals = Counter()
+        field_counts = Counter()
+
+        for category, items in resources.items():
+            for resource in items:
+                doc_id = len(self.documents)
+                term_counts, lengths = {}, {}
+                for field, text in _field_texts(resource).items():
+                    tokens = tokenize(text)
+                    term_counts[field] = Counter(tokens)
+                    lengths[field] = len(tokens)
+                    field_length_totals[field] += len(tokens)
+                    field_counts[field] += 1
+                for term in set().union(*term_counts.values()):
+                    self.postings.setdefault(term, []).append(doc_id)
+                self.documents.append((category, resource, term_counts, lengths))
+
+        self.average_lengths = {
+            field: field_length_totals[field] / field_counts[field] or 1.0
+            for field in field_counts
+        }
+
+    def idf(self, term):
+        """Обернена частота документів терміна (варіант BM25, завжди додатна)."""
+        df = len(self.postings.get(term, ()))
+        n = len(self.documents)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def score(self, doc_id, terms):
+        """
+        Оцінка релевантності документа для термінів запиту (BM25F).
+        Частоти термінів зважуються за полями та нормалізуються за довжиною поля.
+        """
+        _, _, term_counts, lengths = self.documents[doc_id]
+        total = 0.0
+        for term in terms:
+            weighted_tf = 0.0
+            for field, counts in term_counts.items():
+                tf = counts.get(term)
+                if not tf:
+                    continue
+                norm = 1 - BM25_B + BM25_B * lengths[field] / self.average_lengths[field]
+                weighted_tf += FIELD_BOOSTS.get(field, DEFAULT_FIELD_BOOST) * tf / norm
+            if weighted_tf:
+                total += self.idf(term) * weighted_tf / (BM25_K1 + weighted_tf)
+        return total
+
+    def iter_matches(self, query):
+        """
+        Генератор збігів (оцінка, категорія, ресурс) у порядку появи документів.
+        Переглядаються лише документи, що містять хоча б один термін запиту,
+        тож перші результати доступні одразу, без очікування повного перебору.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        # Списки документів уже впорядковані за номером, тому їх достатньо злити без сортування
+        postings = [self.postings[term] for term in terms if term in self.postings]
+        previous_doc_id = None
+        for doc_id in heapq.merge(*postings):
+            if doc_id == previous_doc_id:
+                continue
+            previous_doc_id = doc_id
+            category, resource, _, _ = self.documents[doc_id]
+            yield self.score(doc_id, terms), category, resource
+
+def top_k(matches, k=10):
+    """
+    Вибирає k найрелевантніших збігів за допомогою обмеженої купи.
+    Пам'ять - O(k), сортуються лише k відібраних результатів, а не всі збіги.
+    """
+    heap = []
+    for order, (score, category, resource) in enumerate(matches):
+        # Від'ємний порядок: при однаковій оцінці перевага у раніше доданого ресурсу
+        entry = (score, -order, category, resource)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    return [(score, category, resource) for score, _, category, resource in sorted(heap, key=lambda e: e[:2], reverse=True)]
+
+_cached_index = None
+_cached_key = None
+
+def get_index(resources):
+    """
+    Повертає індекс для поточних ресурсів.
+    Ресурси лише додаються, тому індекс перебудовується тільки при зміні кількості записів.
+    """
+    global _cached_index, _cached_key
+    key = tuple((category, len(items)) for category, items in resources.items())
+    if _cached_index is None or key != _cached_key:
+        _cached_index, _cached_key = SearchIndex(resources), key
+    return _cached_index
@@ -0,0 +1,183 @@
+import json
+import shutil
+
+import pytest
+
+import change_feed
+import dedup
+import veteranHubApp
+
+# Кожен вузол - окрема тимчасова директорія з власними veterans.json та data/.
+# Усі шляхи в модулях відносні, тому вузол вибирається зміною робочої директорії.
+
+BASELINE = [
+    {"veteran_id": 1, "name": "Іваненко Іван", "age": 35, "status": "УБД", "region": "м.Луцьк"},
+]
+
+def make_node(tmp_path, name, node_id, baseline=BASELINE):
+    """Створює вузол зі спільним початковим файлом та заданим ID вузла."""
+    node = tmp_path / name
+    (node / "data").mkdir(parents=True)
+    (node / "veterans.json").write_text(json.dumps(baseline, ensure_ascii=False), encoding="utf-8")
+    (node / "data" / "feed_state.json").write_text(json.dumps({"node_id": node_id}), encoding="utf-8")
+    return node
+
+def run_action(monkeypatch, node, action, *answers):
+    """Виконує дію меню veteranHubApp на вузлі з заданими відповідями користувача."""
+    monkeypatch.chdir(node)
+    replies = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(replies))
+    veterans = veteranHubApp.load_veterans()
+    action(veterans)
+    veteranHubApp.save_veterans(veterans)
+
+def export(monkeypatch, node, target, since=0):
+    monkeypatch.chdir(node)
+    return change_feed.export_changes(since, str(target))
+
+def apply(monkeypatch, node, source):
+    monkeypatch.chdir(node)
+    return change_feed.apply_changes(str(source))
+
+def veterans_by_name(node):
+    data = json.loads((node / "veterans.json").read_text(encoding="utf-8"))
+    return {record["name"]: record for record in data}
+
+@pytest.fixture
+def transfer(tmp_path):
+    directory = tmp_path / "transfer"
+    directory.mkdir()
+    return directory
+
+def test_concurrent_adds_sync_without_conflicts(tmp_path, transfer, monkeypatch):
+    a = make_node(tmp_path, "a", "node_a")
+    b = make_node(tmp_path, "b", "node_b")
+    run_action(monkeypatch, a, veteranHubApp.add_veteran, "Анна", "30", "УБД", "Київ")
+    run_action(monkeypatch, b, veteranHubApp.add_veteran, "Борис", "40", "УБД", "Львів")
+    export(monkeypatch, a, transfer)
+    export(monkeypatch, b, transfer)
+
+    for node in (a, b):
+        summary = apply(monkeypatch, node, transfer)
+        assert summary["applied"] == 1
+        assert summary["conflicts"] == []
+
+    for node in (a, b):
+        veterans = veterans_by_name(node)
+        assert {"Анна", "Борис"} <= set(veterans)
+        # Локальні ID не повторюються навіть при одночасних додаваннях
+        assert len({v["veteran_id"] for v in veterans.values()}) == len(veterans)
+
+def test_relayed_edit_is_applied_after_its_add(tmp_path, transfer, monkeypatch):
+    # ID вузлів підібрано так, щоб файл B з редагуванням читався раніше за файл A з додаванням
+    a = make_node(tmp_path, "a", "zz_node_a")
+    b = make_node(tmp_path, "b", "aa_node_b")
+    c = make_node(tmp_path, "c", "node_c")
+    run_action(monkeypatch, a, veteranHubApp.add_veteran, "Анна", "30", "УБД", "Київ")
+    export(monkeypatch, a, transfer)
+    apply(monkeypatch, b, transfer)
+    run_action(monkeypatch, b, veteranHubApp.edit_veteran, "2", "Анна Змінена", "", "", "")
+    # B експортує лише власне редагування (додавання A вже є у файлі A)
+    export(monkeypatch, b, transfer, since=1)
+
+    summary = apply(monkeypatch, c, transfer)
+
+    assert summary["applied"] == 2
+    assert summary["conflicts"] == []
+    assert "Анна Змінена" in veterans_by_name(c)
+    assert "Анна" not in veterans_by_name(c)
+
+def test_reapplying_same_directory_is_idempotent(tmp_path, transfer, monkeypatch):
+    a = make_node(tmp_path, "a", "node_a")
+    b = make_node(tmp_path, "b", "node_b")
+    run_action(monkeypatch, a, veteranHubApp.add_veteran, "Анна", "30", "УБД", "Київ")
+    run_action(monkeypatch, a, veteranHubApp.edit_veteran, "1", "", "36", "", "")
+    export(monkeypatch, a, transfer)
+    apply(monkeypatch, b, transfer)
+    log_before = (b / "data" / "changes.jsonl").read_text(encoding="utf-8")
+    veterans_before = (b / "veterans.json").read_text(encoding="utf-8")
+
+    summary = apply(monkeypatch, b, transfer)
+
+    assert summary["applied"] == 0
+    assert summary["conflicts"] == []
+    assert (b / "data" / "changes.jsonl").read_text(encoding="utf-8") == log_before
+    assert (b / "veterans.json").read_text(encoding="utf-8") == veterans_before
+
+def test_conflict_is_kept_for_retry(tmp_path, transfer, monkeypatch):
+    a = make_node(tmp_path, "a", "node_a")
+    b = make_node(tmp_path, "b", "node_b")
+    run_action(monkeypatch, a, veteranHubApp.edit_veteran, "1", "", "36", "", "")
+    run_action(monkeypatch, b, veteranHubApp.edit_veteran, "1", "", "37", "", "")
+    export(monkeypatch, b, transfer)
+
+    first = apply(monkeypatch, a, transfer)
+    # Повторне застосування не пропускає конфлікт мовчки
+    second = apply(monkeypatch, a, transfer)
+    shutil.rmtree(transfer)
+    transfer.mkdir()
+    third = apply(monkeypatch, a, transfer)
+
+    assert len(first["conflicts"]) == 1
+    assert len(second["conflicts"]) == 1
+    assert len(third["conflicts"]) == 1
+    assert veterans_by_name(a)["Іваненко Іван"]["age"] == 36
+
+    assert change_feed.discard_conflict("node_b", 1)
+    assert apply(monkeypatch, a, transfer)["conflicts"] == []
+
+def test_dedup_merge_is_replicated(tmp_path, transfer, monkeypatch):
+    # Оригінал без статусу отримає його від дубліката
+    baseline = [
+        dict(BASELINE[0], status=""),
+        {"veteran_id": 2, "name": "іваненко  іван", "age": 35, "status": "УБД", "region": "м.Луцьк"},
+    ]
+    a = make_node(tmp_path, "a", "node_a", baseline)
+    b = make_node(tmp_path, "b", "node_b", baseline)
+    monkeypatch.chdir(a)
+    veterans = veteranHubApp.load_veterans()
+    previous_states = {id(v): dict(v.to_dict()) for v in veterans}
+    merged = dedup.deduplicate(veterans, merge=True)
+    dedup.record_merge_changes("veterans", veterans, merged, previous_states)
+    veteranHubApp.save_veterans(merged)
+    export(monkeypatch, a, transfer)
+
+    summary = apply(monkeypatch, b, transfer)
+
+    assert summary["conflicts"] == []
+    assert list(veterans_by_name(b)) == ["Іваненко Іван"]
+    assert veterans_by_name(b)["Іваненко Іван"]["status"] == "УБД"
+
+def test_uid_is_not_reused_after_delete(tmp_path, monkeypatch):
+    a = make_node(tmp_path, "a", "node_a")
+    run_action(monkeypatch, a, veteranHubApp.add_veteran, "Петро", "30", "УБД", "Київ")
+    run_action(monkeypatch, a, veteranHubApp.delete_veteran, "2")
+    run_action(monkeypatch, a, veteranHubApp.add_veteran, "Олег", "40", "УБД", "Львів")
+
+    log = [json.loads(line) for line in (a / "data" / "changes.jsonl").read_text(encoding="utf-8").splitlines()]
+    petro_uid, oleg_uid = log[0]["key"], log[2]["key"]
+
+    # Обидва записи отримали однаковий локальний ID, але різні uid
+    assert veterans_by_name(a)["Олег"]["veteran_id"] == 2
+    assert petro_uid != oleg_uid
+
+def test_duplicate_add_from_feed_is_not_inserted(tmp_path, transfer, monkeypatch):
+    a = make_node(tmp_path, "a", "node_a")
+    b = make_node(tmp_path, "b", "node_b")
+    run_action(monkeypatch, a, veteranHubApp.add_veteran, "Анна", "30", "УБД", "Київ")
+    run_action(monkeypatch, b, veteranHubApp.add_veteran, "анна", "30", "", "київ")
+    export(monkeypatch, b, transfer)
+
+    summary = apply(monkeypatch, a, transfer)
+
+    assert [change["reason"] for change in summary["conflicts"]] == ["duplicate"]
+    names = [record["name"].casefold() for record in json.loads((a / "veterans.json").read_text(encoding="utf-8"))]
+    assert names.count("анна") == 1
+
+def test_missing_source_directory_is_reported(tmp_path, monkeypatch, capsys):
+    a = make_node(tmp_path, "a", "node_a")
+
+    summary = apply(monkeypatch, a, tmp_path / "missing")
+
+    assert summary == {"applied": 0, "skipped": 0, "conflicts": []}
+    assert "не знайдено" in capsys.readouterr().out
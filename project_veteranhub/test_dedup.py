@@ -0,0 +1,72 @@
+from dedup import FingerprintIndex, deduplicate, identity_fingerprint, merge_into
+from resource_classes import JobPosting
+
+def job(title="Водій", company="ТОВ Світанок", description="", requirements=(), contact=""):
+    return JobPosting(title, company, description, set(requirements), contact)
+
+def test_index_rejects_duplicate_ignoring_case_and_spaces():
+    index = FingerprintIndex()
+    original = job()
+
+    assert index.add(original)
+    assert not index.add(job(title="  водій ", company="тов  світанок"))
+    assert len(index) == 1
+    assert identity_fingerprint(original) in index
+
+def test_index_keeps_every_loaded_duplicate():
+    first, second = job(), job(contact="050")
+    index = FingerprintIndex([first, second])
+
+    assert index.find(first) is second
+    assert index.find(second) is first
+    assert index.find(job(title="Кухар")) is None
+
+def test_index_remove_drops_only_that_record():
+    first, second = job(), job(contact="050")
+    index = FingerprintIndex([first, second])
+
+    index.remove(first)
+    assert index.find(job()) is second
+    index.remove(second)
+    assert identity_fingerprint(second) not in index
+
+def test_index_remove_uses_old_fingerprint_after_edit():
+    record = job()
+    index = FingerprintIndex([record])
+    old_fingerprint = identity_fingerprint(record)
+    record.title = "Кухар"
+
+    index.remove(record, old_fingerprint)
+
+    assert len(index) == 0
+
+def test_merge_into_fills_empty_fields_and_unions_sets():
+    original = job(requirements={"досвід"})
+    duplicate = job(description="Повний день", requirements={"посвідчення"}, contact="050")
+
+    merge_into(original, duplicate)
+
+    assert original.description == "Повний день"
+    assert original.contact == "050"
+    assert original.requirements == {"досвід", "посвідчення"}
+
+def test_merge_into_keeps_filled_fields():
+    original = job(contact="067")
+
+    merge_into(original, job(contact="050"))
+
+    assert original.contact == "067"
+
+def test_deduplicate_keeps_first_occurrences_in_order():
+    first, other, duplicate = job(), job(title="Кухар"), job(title="водій", contact="050")
+
+    assert deduplicate([first, other, duplicate]) == [first, other]
+    assert first.contact == ""
+
+def test_deduplicate_with_merge_combines_data():
+    first, duplicate = job(), job(title="водій", contact="050")
+
+    result = deduplicate([first, duplicate], merge=True)
+
+    assert result == [first]
+    assert first.contact == "050"
@@ -0,0 +1,41 @@
+from resource_classes import JobPosting
+from search import SearchIndex, top_k
+
+def job(title, description):
+    return JobPosting(title, "ТОВ Світанок", description, set(), "050")
+
+def test_title_match_outranks_same_term_in_description():
+    # Поля однакової довжини, тож різниця в оцінці - лише від ваги поля
+    in_title = job("Водій автобуса", "Повний робочий день")
+    in_description = job("Кухар їдальні", "Водій повний день")
+    index = SearchIndex({"jobs": [in_description, in_title]})
+
+    ranked = top_k(index.iter_matches("водій"))
+
+    assert [resource for _, _, resource in ranked] == [in_title, in_description]
+    assert ranked[0][0] > ranked[1][0]
+
+def test_iter_matches_yields_each_document_once_in_order():
+    first = job("Водій автобуса", "Повний день")
+    second = job("Кухар", "Повний день, водій не потрібен")
+    unrelated = job("Охоронець", "Нічні зміни")
+    index = SearchIndex({"jobs": [first, second, unrelated]})
+
+    matches = list(index.iter_matches("водій повний"))
+
+    assert [resource for _, _, resource in matches] == [first, second]
+
+def test_top_k_returns_best_matches_by_score():
+    matches = [(1.0, "jobs", "a"), (3.0, "jobs", "b"), (2.0, "jobs", "c"), (0.5, "jobs", "d")]
+
+    assert top_k(matches, k=2) == [(3.0, "jobs", "b"), (2.0, "jobs", "c")]
+
+def test_top_k_keeps_earlier_matches_on_ties():
+    matches = [(1.0, "jobs", name) for name in "abcde"]
+
+    assert [resource for _, _, resource in top_k(matches, k=3)] == ["a", "b", "c"]
+
+def test_top_k_with_fewer_matches_than_k():
+    matches = [(1.0, "jobs", "a"), (2.0, "legal", "b")]
+
+    assert top_k(matches, k=10) == [(2.0, "legal", "b"), (1.0, "jobs", "a")]
@@ -1,23 +1,49 @@
 import os
+import sys
 
-def clear_screen():
+# ANSI-послідовність: очистити екран і перемістити курсор у верхній лівий кут.
+# Не потребує запуску зовнішньої команди 'clear'/'cls' на кожну перемальовку.
+ANSI_CLEAR_SCREEN = "\033[2J\033[H"
+
+if os.name == 'nt':
+    # Вмикає обробку ANSI-послідовностей у консолі Windows 10+
+    os.system('')
+
+def is_interactive(stream=None):
     """
-    Очищає екран консолі.
-    Використовує модуль os.
+    Перевіряє, чи виведення йде у термінал (а не у файл чи канал).
     """
-    os.system('cls' if os.name == 'nt' else 'clear')
+    stream = stream or sys.stdout
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
 
-def log_function_call(func):
+class Screen:
     """
-    Декоратор, який логує виклик функції та її назву.
-    Демонструє створення та використання декораторів.
+    Буфер для складання екрана з кількох рядків.
+    Весь екран виводиться одним записом, що зменшує затримки при роботі через SSH.
     """
-    def wrapper(*args, **kwargs):
-        print(f"\n[ЛОГ] Викликається функція: '{func.__name__}'")
-        result = func(*args, **kwargs)
-        print(f"[ЛОГ] Функція '{func.__name__}' завершила роботу.")
-        return result
-    return wrapper
+    def __init__(self, clear=True):
+        self.clear = clear
+        self.lines = []
+
+    def add(self, *lines):
+        """Додає один або кілька рядків до екрана."""
+        self.lines.extend(lines)
+        return self
+
+    def render(self, stream=None):
+        """
+        Виводить екран одним записом.
+        Очищення екрана додається лише для термінала.
+        """
+        stream = stream or sys.stdout
+        text = "\n".join(str(line) for line in self.lines) + "\n"
+        if self.clear and is_interactive(stream):
+            text = ANSI_CLEAR_SCREEN + text
+        stream.write(text)
+        stream.flush()
 
 def get_user_input(prompt, type_converter=str):
     """
@@ -33,4 +59,4 @@ def get_user_input(prompt, type_converter=str):
         except ValueError:
             print(f"Невірний формат введення. Будь ласка, введіть значення типу {type_converter.__name__}.")
         except Exception as e:
-            print(f"Виникла невідома помилка: {e}")
\ No newline at end of file
+            print(f"Виникла невідома помилка: {e}")
@@ -8,6 +8,8 @@
 import json
 import os
 from typing import Callable
+from change_feed import mark_app_running, new_uid, record_change
+from dedup import FingerprintIndex, identity_fingerprint
 
 # === Глобальні змінні ===
 DATA_FILE = "veterans.json"
@@ -21,12 +23,18 @@ def log_action(func: Callable) -> Callable:
 
 # === Клас Veteran ===
 class Veteran:
-    def __init__(self, veteran_id: int, name: str, age: int, status: str, region: str):
+    # Поля, за якими два записи вважаються дублікатами (див. dedup.py)
+    IDENTITY_FIELDS = ("name", "region", "age")
+
+    def __init__(self, veteran_id: int, name: str, age: int, status: str, region: str, uid: str = None):
         self.veteran_id = veteran_id
         self.name = name
         self.age = age
         self.status = status  # "демобілізований" / "учасник війни" / "УБД" / "інвалід внаслідок війни" / "член сім'ї загиблого Захисника України"
         self.region = region
+        # Ідентифікатор, унікальний для всіх вузлів синхронізації (veteran_id - лише локальний).
+        # Записи без uid походять зі спільного початкового файлу, тому їхній veteran_id однаковий на всіх вузлах.
+        self.uid = uid or str(veteran_id)
 
     def to_dict(self) -> dict:
         return self.__dict__
@@ -50,15 +58,21 @@ def save_veterans(veterans: list):
 
 # === CRUD операції ===
 @log_action
-def add_veteran(veterans: list):
+def add_veteran(veterans: list, index: FingerprintIndex = None):
+    index = index if index is not None else FingerprintIndex(veterans)
     try:
         veteran_id = max([v.veteran_id for v in veterans], default=0) + 1
         name = input("Ім'я та прізвище: ")
         age = int(input("Вік: "))
         status = input("Статус (демобілізований/учасник війни/УБД/інвалід внаслідок війни/член сім'ї загиблого Захисника України): ")
         region = input("Регіон проживання: ")
-        veteran = Veteran(veteran_id, name, age, status, region)
+        veteran = Veteran(veteran_id, name, age, status, region, new_uid())
+        if not index.add(veteran):
+            print("❌ Ветеран з таким ім'ям, регіоном та віком вже існує.")
+            return
         veterans.append(veteran)
+        record_change("veterans", "add", veteran.uid, dict(veteran.to_dict()))
+        save_veterans(veterans) # Зберігаємо одразу, щоб файл відповідав журналу змін
         print("✔ Додано успішно!")
     except ValueError:
         print("❌ Помилка введення. Спробуйте ще раз.")
@@ -104,13 +118,18 @@ def _display_found(found: list):
             print(f"{v.veteran_id}: {v.name}, {v.age} р. | {v.status} | {v.region}")
 
 @log_action
-def delete_veteran(veterans: list):
+def delete_veteran(veterans: list, index: FingerprintIndex = None):
     try:
         id_to_delete = int(input("Введіть ID для видалення: "))
         updated = [v for v in veterans if v.veteran_id != id_to_delete]
         if len(updated) < len(veterans):
+            deleted = next(v for v in veterans if v.veteran_id == id_to_delete)
+            if index is not None:
+                index.remove(deleted)
             veterans.clear()
             veterans.extend(updated)
+            record_change("veterans", "delete", deleted.uid, previous=dict(deleted.to_dict()))
+            save_veterans(veterans)
             print("✔ Видалено.")
         else:
             print("❌ Не знайдено ID.")
@@ -118,7 +137,8 @@ def delete_veteran(veterans: list):
         print("❌ Некоректне значення.")
 
 @log_action
-def edit_veteran(veterans: list):
+def edit_veteran(veterans: list, index: FingerprintIndex = None):
+    index = index if index is not None else FingerprintIndex(veterans)
     try:
         id_to_edit = int(input("Введіть ID для редагування: "))
         for v in veterans:
@@ -129,7 +149,20 @@ def edit_veteran(veterans: list):
                 age = int(age_input) if age_input else v.age
                 status = input(f"Статус ({v.status}): ").strip() or v.status
                 region = input(f"Регіон ({v.region}): ").strip() or v.region
+                previous = dict(v.to_dict())
+                old_fingerprint = identity_fingerprint(v)
                 v.name, v.age, v.status, v.region = name, age, status, region
+                # Перевіряємо лише зміну ключових полів: запис, що вже має дублікат у файлі, можна редагувати
+                if identity_fingerprint(v) != old_fingerprint:
+                    if index.find(v) not in (None, v):
+                        # Зміни зробили б запис дублікатом іншого - відкочуємо їх
+                        v.name, v.age, v.status, v.region = previous["name"], previous["age"], previous["status"], previous["region"]
+                        print("❌ Ветеран з таким ім'ям, регіоном та віком вже існує.")
+                        return
+                    index.remove(v, old_fingerprint)
+                    index.add(v)
+                record_change("veterans", "edit", v.uid, dict(v.to_dict()), previous)
+                save_veterans(veterans)
                 print("✔ Запис оновлено.")
                 return
         print("❌ Не знайдено ID.")
@@ -153,18 +186,20 @@ def menu():
 
 # === Головна функція ===
 def main():
+    mark_app_running()
     veterans = load_veterans()
+    index = FingerprintIndex(veterans) # Індекс для перевірки дублікатів за O(1)
     while True:
         menu()
         choice = input("Оберіть дію: ").strip()
         if choice == "1":
-            add_veteran(veterans)
+            add_veteran(veterans, index)
         elif choice == "2":
             list_veterans(veterans)
         elif choice == "3":
             find_by_region(veterans)
         elif choice == "4":
-            delete_veteran(veterans)
+            delete_veteran(veterans, index)
         elif choice == "5":
             find_by_name(veterans)
         elif choice == "6":
@@ -172,7 +207,7 @@ def main():
         elif choice == "7":
             filter_by_age(veterans)
         elif choice == "8":
-            edit_veteran(veterans)
+            edit_veteran(veterans, index)
         elif choice == "0":
             save_veterans(veterans)
             print("Збережено. До зустрічі!")
@@ -1,8 +1,19 @@
+import time
+_START_TIME = time.perf_counter() # Початок відліку для --profile-startup
+
+import argparse
 import os
 import sys
+from change_feed import mark_app_running, record_change, resource_key
 from data_manager import load_resources, save_resources
+from dedup import FingerprintIndex, values_fingerprint
+import tracemalloc
+from memory_report import build_report, report_sizes, take_snapshot
+from search import get_index, top_k
 from resource_classes import JobPosting, PsychologistContact, LegalAid, EducationProgram, SocialGroup
-from utils import clear_screen, log_function_call, get_user_input
+from utils import Screen, get_user_input
+
+_IMPORTS_DONE_TIME = time.perf_counter()
 
 # Глобальні словники для зберігання ресурсів
 # Використання словників для швидкого доступу за ID або іншими ключами
@@ -15,6 +26,26 @@ resources = {
     "social_groups": []
 }
 
+# Назви категорій для відображення
+CATEGORY_TITLES = {
+    "jobs": "Вакансії",
+    "psychologists": "Психологи",
+    "legal_aids": "Юридична Допомога",
+    "education": "Освітні Програми",
+    "social_groups": "Соціальні Групи"
+}
+
+# Кількість найрелевантніших результатів глобального пошуку
+SEARCH_TOP_K = 10
+# Кількість перших збігів, що показуються одразу, до завершення ранжування
+SEARCH_PREVIEW_COUNT = 3
+
+# Індекси відбитків для перевірки дублікатів за O(1) у кожній категорії
+fingerprint_indexes = {category: FingerprintIndex() for category in resources}
+
+# Розміри з попереднього звіту для порівняння "до/після" між викликами звіту
+_previous_memory_sizes = None
+
 # Назви файлів для збереження даних
 DATA_FILES = {
     "jobs": "data/jobs.json",
@@ -35,6 +66,8 @@ def initialize_data():
             # Завантажуємо дані для кожної категорії
             loaded_data = load_resources(filename, category)
             resources[category].extend(loaded_data)
+            for resource in loaded_data:
+                fingerprint_indexes[category].add(resource, allow_duplicate=True)
             print(f"Дані для '{category}' завантажено успішно.")
         except FileNotFoundError:
             print(f"Файл '{filename}' не знайдено. Буде створено новий.")
@@ -56,53 +89,55 @@ def save_all_data():
         except Exception as e:
             print(f"Помилка при збереженні даних у '{filename}': {e}")
 
-@log_function_call # Застосування декоратора для логування виклику функції
 def display_main_menu():
     """
     Відображає головне меню програми.
+    Екран складається в буфері та виводиться одним записом.
     """
-    clear_screen()
-    print("=" * 40)
-    print("         НАВІГАТОР ПЕРЕХОДУ         ")
-    print("  Допомога ветеранам та демобілізованим")
-    print("=" * 40)
-    print("\nОберіть категорію ресурсів:")
-    print("1. Працевлаштування та Кар'єра")
-    print("2. Психологічна Підтримка")
-    print("3. Юридична Допомога")
-    print("4. Освіта та Навчання")
-    print("5. Соціальна Адаптація")
-    print("6. Додати новий ресурс")
-    print("0. Вийти з програми")
-    print("-" * 40)
+    Screen().add(
+        "=" * 40,
+        "         НАВІГАТОР ПЕРЕХОДУ         ",
+        "  Допомога ветеранам та демобілізованим",
+        "=" * 40,
+        "\nОберіть категорію ресурсів:",
+        "1. Працевлаштування та Кар'єра",
+        "2. Психологічна Підтримка",
+        "3. Юридична Допомога",
+        "4. Освіта та Навчання",
+        "5. Соціальна Адаптація",
+        "6. Додати новий ресурс",
+        "7. Звіт про використання пам'яті",
+        "8. Пошук у всіх категоріях",
+        "0. Вийти з програми",
+        "-" * 40,
+    ).render()
 
 def display_resource_menu(category_name):
     """
     Відображає меню для конкретної категорії ресурсів.
     """
-    clear_screen()
-    print(f"--- {category_name} ---")
-    print("1. Переглянути всі ресурси")
-    print("2. Знайти ресурс (за ключовим словом)")
-    print("3. Повернутися до головного меню")
-    print("-" * 40)
+    Screen().add(
+        f"--- {category_name} ---",
+        "1. Переглянути всі ресурси",
+        "2. Знайти ресурс (за ключовим словом)",
+        "3. Повернутися до головного меню",
+        "-" * 40,
+    ).render()
 
 def view_resources(category_key, title):
     """
     Переглядає та виводить список ресурсів для заданої категорії.
     Демонструє використання циклу for та умовних операторів.
     """
-    clear_screen()
-    print(f"--- Всі {title} ---")
+    screen = Screen().add(f"--- Всі {title} ---")
     if not resources[category_key]:
-        print(f"Наразі немає доступних {title.lower()}.")
+        screen.add(f"Наразі немає доступних {title.lower()}.").render()
         input("\nНатисніть Enter, щоб продовжити...")
         return
 
     for i, resource in enumerate(resources[category_key]):
-        print(f"\n--- Ресурс #{i+1} ---")
-        print(resource) # Виклик методу __str__ об'єкта
-        print("-" * 20)
+        screen.add(f"\n--- Ресурс #{i+1} ---", resource, "-" * 20) # resource виводиться через __str__
+    screen.render()
     input("\nНатисніть Enter, щоб продовжити...")
 
 def search_resources(category_key, title):
@@ -110,8 +145,7 @@ def search_resources(category_key, title):
     Шукає ресурси за ключовим словом у заданій категорії.
     Демонструє використання генераторів списків та булевих операторів.
     """
-    clear_screen()
-    print(f"--- Пошук {title} ---")
+    Screen().add(f"--- Пошук {title} ---").render()
     search_term = get_user_input("Введіть ключове слово для пошуку: ").lower()
 
     # Використання генератора списків для фільтрації
@@ -120,14 +154,14 @@ def search_resources(category_key, title):
         if search_term in str(resource).lower() # Пошук у строковому представленні об'єкта
     ]
 
+    screen = Screen(clear=False)
     if not found_resources:
-        print(f"Не знайдено {title.lower()} за запитом '{search_term}'.")
+        screen.add(f"Не знайдено {title.lower()} за запитом '{search_term}'.")
     else:
-        print(f"\nЗнайдено {len(found_resources)} {title.lower()} за запитом '{search_term}':")
+        screen.add(f"\nЗнайдено {len(found_resources)} {title.lower()} за запитом '{search_term}':")
         for i, resource in enumerate(found_resources):
-            print(f"\n--- Знайдений ресурс #{i+1} ---")
-            print(resource)
-            print("-" * 20)
+            screen.add(f"\n--- Знайдений ресурс #{i+1} ---", resource, "-" * 20)
+    screen.render()
     input("\nНатисніть Enter, щоб продовжити...")
 
 def add_new_resource_menu():
@@ -135,15 +169,16 @@ def add_new_resource_menu():
     Меню для додавання нового ресурсу.
     Демонструє використання словників для мапінгу вибору до функцій (функції як об'єкти першого класу).
     """
-    clear_screen()
-    print("--- Додати Новий Ресурс ---")
-    print("1. Вакансію")
-    print("2. Контакт психолога")
-    print("3. Юридичну допомогу")
-    print("4. Освітню програму")
-    print("5. Соціальну групу")
-    print("0. Повернутися до головного меню")
-    print("-" * 40)
+    Screen().add(
+        "--- Додати Новий Ресурс ---",
+        "1. Вакансію",
+        "2. Контакт психолога",
+        "3. Юридичну допомогу",
+        "4. Освітню програму",
+        "5. Соціальну групу",
+        "0. Повернутися до головного меню",
+        "-" * 40,
+    ).render()
 
     add_choice = get_user_input("Ваш вибір: ", int)
 
@@ -164,19 +199,27 @@ def add_new_resource_menu():
         print("Невірний вибір. Спробуйте ще раз.")
         input("Натисніть Enter, щоб продовжити...")
 
+def store_resource(category_key, resource):
+    """
+    Додає ресурс до категорії, якщо в ній немає дубліката.
+    Реєструє зміну в журналі та повертає True у разі успіху.
+    """
+    if not fingerprint_indexes[category_key].add(resource):
+        return False
+    resources[category_key].append(resource)
+    record_change(category_key, "add", resource_key(resource), resource.to_dict())
+    return True
+
 def add_job_posting():
     """Додає нову вакансію."""
-    clear_screen()
-    print("--- Додати Нову Вакансію ---")
+    Screen().add("--- Додати Нову Вакансію ---").render()
     title = get_user_input("Назва вакансії: ")
     company = get_user_input("Компанія: ")
-
-    # Перевірка на дублікати
-    for job in resources["jobs"]:
-        if job.title.lower() == title.lower() and job.company.lower() == company.lower():
-            print("\nПомилка: Вакансія з такою назвою та компанією вже існує.")
-            input("Натисніть Enter, щоб продовжити...")
-            return
+    # Рання перевірка на дублікат (поля JobPosting.IDENTITY_FIELDS), щоб не вводити решту даних даремно
+    if values_fingerprint(JobPosting, {"title": title, "company": company}) in fingerprint_indexes["jobs"]:
+        print("\nПомилка: Така вакансія вже існує.")
+        input("Натисніть Enter, щоб продовжити...")
+        return
 
     description = get_user_input("Опис вакансії: ")
     requirements_str = get_user_input("Вимоги (через кому, наприклад: досвід, освіта): ")
@@ -185,15 +228,18 @@ def add_job_posting():
     contact = get_user_input("Контактна інформація: ")
 
     new_job = JobPosting(title, company, description, requirements, contact)
-    resources["jobs"].append(new_job)
+    # Остаточна перевірка при додаванні до індексу
+    if not store_resource("jobs", new_job):
+        print("\nПомилка: Така вакансія вже існує.")
+        input("Натисніть Enter, щоб продовжити...")
+        return
     print("Вакансію успішно додано!")
-    input("Натисніть Enter, щоб продовжити...")
     save_all_data()
+    input("Натисніть Enter, щоб продовжити...")
 
 def add_psychologist_contact():
     """Додає новий контакт психолога."""
-    clear_screen()
-    print("--- Додати Контакт Психолога ---")
+    Screen().add("--- Додати Контакт Психолога ---").render()
     name = get_user_input("Ім'я психолога: ")
     specialization = get_user_input("Спеціалізація: ")
     contact = get_user_input("Контактна інформація (телефон, email): ")
@@ -201,30 +247,34 @@ def add_psychologist_contact():
     schedule = get_user_input("Графік роботи (наприклад, Пн-Пт 9:00-18:00): ")
 
     new_psychologist = PsychologistContact(name, specialization, contact, schedule)
-    resources["psychologists"].append(new_psychologist)
+    if not store_resource("psychologists", new_psychologist):
+        print("\nПомилка: Такий ресурс вже існує.")
+        input("Натисніть Enter, щоб продовжити...")
+        return
     print("Контакт психолога успішно додано!")
-    input("Натисніть Enter, щоб продовжити...")
     save_all_data()
+    input("Натисніть Enter, щоб продовжити...")
 
 def add_legal_aid():
     """Додає нову інформацію про юридичну допомогу."""
-    clear_screen()
-    print("--- Додати Юридичну Допомогу ---")
+    Screen().add("--- Додати Юридичну Допомогу ---").render()
     organization = get_user_input("Назва організації: ")
     service_type = get_user_input("Тип послуги (наприклад, консультація, представництво): ")
     contact = get_user_input("Контактна інформація: ")
     description = get_user_input("Опис послуги: ")
 
     new_legal_aid = LegalAid(organization, service_type, contact, description)
-    resources["legal_aids"].append(new_legal_aid)
+    if not store_resource("legal_aids", new_legal_aid):
+        print("\nПомилка: Такий ресурс вже існує.")
+        input("Натисніть Enter, щоб продовжити...")
+        return
     print("Юридичну допомогу успішно додано!")
-    input("Натисніть Enter, щоб продовжити...")
     save_all_data()
+    input("Натисніть Enter, щоб продовжити...")
 
 def add_education_program():
     """Додає нову освітню програму."""
-    clear_screen()
-    print("--- Додати Освітню Програму ---")
+    Screen().add("--- Додати Освітню Програму ---").render()
     name = get_user_input("Назва програми: ")
     institution = get_user_input("Навчальний заклад: ")
     duration = get_user_input("Тривалість (наприклад, 6 місяців): ")
@@ -232,15 +282,17 @@ def add_education_program():
     contact = get_user_input("Контактна інформація: ")
 
     new_education = EducationProgram(name, institution, duration, description, contact)
-    resources["education"].append(new_education)
+    if not store_resource("education", new_education):
+        print("\nПомилка: Такий ресурс вже існує.")
+        input("Натисніть Enter, щоб продовжити...")
+        return
     print("Освітню програму успішно додано!")
-    input("Натисніть Enter, щоб продовжити...")
     save_all_data()
+    input("Натисніть Enter, щоб продовжити...")
 
 def add_social_group():
     """Додає нову соціальну групу."""
-    clear_screen()
-    print("--- Додати Соціальну Групу ---")
+    Screen().add("--- Додати Соціальну Групу ---").render()
     name = get_user_input("Назва групи: ")
     focus_area = get_user_input("Напрямок діяльності (наприклад, підтримка, хобі): ")
     location = get_user_input("Місце проведення/онлайн: ")
@@ -248,10 +300,66 @@ def add_social_group():
     description = get_user_input("Опис групи: ")
 
     new_social_group = SocialGroup(name, focus_area, location, contact, description)
-    resources["social_groups"].append(new_social_group)
+    if not store_resource("social_groups", new_social_group):
+        print("\nПомилка: Такий ресурс вже існує.")
+        input("Натисніть Enter, щоб продовжити...")
+        return
     print("Соціальну групу успішно додано!")
-    input("Натисніть Enter, щоб продовжити...")
     save_all_data()
+    input("Натисніть Enter, щоб продовжити...")
+
+def global_search():
+    """
+    Шукає ресурси в усіх категоріях одночасно та ранжує їх за релевантністю.
+    Перші SEARCH_PREVIEW_COUNT збігів показуються одразу одним записом,
+    а після перегляду всіх збігів - k найрелевантніших.
+    """
+    Screen().add("--- Пошук у всіх категоріях ---").render()
+    query = get_user_input("Введіть запит (наприклад, ПТСР Київ): ")
+    match_count = 0
+
+    def stream_matches():
+        # Генератор рахує збіги та передає їх далі для ранжування;
+        # перші збіги виводяться, щойно їх набереться SEARCH_PREVIEW_COUNT
+        nonlocal match_count
+        preview = Screen(clear=False).add("\nПерші збіги:")
+        for match in get_index(resources).iter_matches(query):
+            match_count += 1
+            if match_count <= SEARCH_PREVIEW_COUNT:
+                _, category, resource = match
+                preview.add(f"  [{CATEGORY_TITLES[category]}] {resource.title}")
+                if match_count == SEARCH_PREVIEW_COUNT:
+                    preview.render()
+            yield match
+
+    results = top_k(stream_matches(), SEARCH_TOP_K)
+
+    screen = Screen(clear=False)
+    if not results:
+        screen.add(f"Нічого не знайдено за запитом '{query}'.")
+    else:
+        screen.add(f"\nВсього збігів: {match_count}. Найрелевантніші результати ({len(results)}):")
+        for i, (score, category, resource) in enumerate(results, start=1):
+            screen.add(f"\n--- #{i} [{CATEGORY_TITLES[category]}] релевантність {score:.2f} ---", resource, "-" * 20)
+    screen.render()
+    input("\nНатисніть Enter, щоб продовжити...")
+
+def show_memory_report():
+    """
+    Показує звіт про пам'ять, яку займають ресурси та список ветеранів.
+    Кожен виклик порівнює розміри категорій з попереднім звітом.
+    tracemalloc тут не вмикається, щоб не сповільнювати решту сеансу (див. --memory-report).
+    """
+    global _previous_memory_sizes
+    from veteranHubApp import load_veterans # Список ветеранів ведеться окремим застосунком
+    veterans = load_veterans()
+    sizes = report_sizes(resources, veterans)
+    lines = build_report(resources, veterans, previous_sizes=_previous_memory_sizes, sizes=sizes)
+    if _previous_memory_sizes is None:
+        lines.append("\nРозміри збережено. Наступний звіт покаже зміни відносно них.")
+    _previous_memory_sizes = sizes
+    Screen().add(*lines).render()
+    input("\nНатисніть Enter, щоб продовжити...")
 
 def handle_category_choice(category_key, title):
     """
@@ -273,11 +381,68 @@ def handle_category_choice(category_key, title):
             print("Невірний вибір. Спробуйте ще раз.")
             input("Натисніть Enter, щоб продовжити...")
 
-def main():
+def parse_args(argv=None):
+    """
+    Розбирає аргументи командного рядка.
+    """
+    parser = argparse.ArgumentParser(description="Навігатор Переходу")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Вивести час імпорту, завантаження даних та першого відображення меню")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="Вивести звіт про пам'ять до та після завантаження даних")
+    return parser.parse_args(argv)
+
+def profile_startup():
+    """
+    Вимірює етапи запуску: імпорт модулів, завантаження даних та перше відображення меню.
+    Звіт виводиться у stderr, щоб не змішуватися з виведенням меню.
+    """
+    load_start = time.perf_counter()
+    initialize_data()
+    render_start = time.perf_counter()
+    display_main_menu()
+    render_end = time.perf_counter()
+
+    timings = [
+        ("Імпорт модулів", _IMPORTS_DONE_TIME - _START_TIME),
+        ("Завантаження даних", render_start - load_start),
+        ("Перше відображення меню", render_end - render_start),
+        ("Загалом", render_end - _START_TIME),
+    ]
+    report = Screen(clear=False).add("\n--- Профіль запуску ---")
+    for label, seconds in timings:
+        report.add(f"{label:<25} {seconds * 1000:8.2f} мс")
+    report.render(sys.stderr)
+
+def memory_report():
+    """
+    Виводить звіт про пам'ять із порівнянням знімків до та після завантаження даних.
+    """
+    from veteranHubApp import load_veterans
+    tracemalloc.start()
+    try:
+        before = take_snapshot()
+        initialize_data()
+        veterans = load_veterans()
+        after = take_snapshot()
+    finally:
+        tracemalloc.stop()
+    Screen(clear=False).add(*build_report(resources, veterans, before, after)).render()
+
+def main(argv=None):
     """
     Головна функція програми.
     Містить основний цикл виконання та обробку вибору користувача.
     """
+    args = parse_args(argv)
+    if args.profile_startup:
+        profile_startup()
+        return
+    if args.memory_report:
+        memory_report()
+        return
+
+    mark_app_running() # Поки програма працює, change_feed.py не застосовує дельти
     initialize_data() # Ініціалізація даних при старті програми
 
     program_running = True # Булева змінна для керування головним циклом
@@ -286,26 +451,31 @@ def main():
         choice = get_user_input("Ваш вибір: ", int) # Обробка виключень для введення
 
         if choice == 1:
-            handle_category_choice("jobs", "Вакансії")
+            handle_category_choice("jobs", CATEGORY_TITLES["jobs"])
         elif choice == 2:
-            handle_category_choice("psychologists", "Психологи")
+            handle_category_choice("psychologists", CATEGORY_TITLES["psychologists"])
         elif choice == 3:
-            handle_category_choice("legal_aids", "Юридична Допомога")
+            handle_category_choice("legal_aids", CATEGORY_TITLES["legal_aids"])
         elif choice == 4:
-            handle_category_choice("education", "Освітні Програми")
+            handle_category_choice("education", CATEGORY_TITLES["education"])
         elif choice == 5:
-            handle_category_choice("social_groups", "Соціальні Групи")
+            handle_category_choice("social_groups", CATEGORY_TITLES["social_groups"])
         elif choice == 6:
             add_new_resource_menu()
+        elif choice == 7:
+            show_memory_report()
+        elif choice == 8:
+            global_search()
         elif choice == 0:
-            clear_screen() # Очищення екрану перед виходом
-            print("=" * 40)
-            print("  Дякуємо за використання 'Навігатора Переходу'!")
-            print("         До побачення!         ")
-            print("=" * 40)
+            Screen().add( # Очищення екрану перед виходом
+                "=" * 40,
+                "  Дякуємо за використання 'Навігатора Переходу'!",
+                "         До побачення!         ",
+                "=" * 40,
+            ).render()
             program_running = False # Зміна булевої змінної для виходу з циклу
         else:
-            print("Невірний вибір. Будь ласка, введіть число від 0 до 6.")
+            print("Невірний вибір. Будь ласка, введіть число від 0 до 8.")
             input("Натисніть Enter, щоб продовжити...")
 
     save_all_data() # Збереження всіх даних при виході з програми